@@ -5,16 +5,121 @@
 import json
 import logging
 import os
-from datetime import datetime, timedelta
-from functools import wraps
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache, wraps
 from typing import Callable
 
-import boto3
 import requests
-from requests.exceptions import RequestException, Timeout
+from requests.adapters import HTTPAdapter
+from requests.exceptions import InvalidJSONError, RequestException, Timeout
+from urllib3.util.retry import Retry
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger()
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the standard library
+    orjson = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+GUARDIAN_API_URL = os.getenv("GUARDIAN_API_URL")
+GUARDIAN_API_KEY = os.getenv("GUARDIAN_API_KEY")
+SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
+
+REQUIRED_FIELDS = frozenset(("webPublicationDate", "webTitle", "webUrl"))
+PAGE_SIZE = 10
+PREVIEW_LENGTH = 1000
+SEARCH_CACHE_SIZE = 64
+SEARCH_CACHE_TTL_SECONDS = 60
+BASE_PARAMS = {
+    "page-size": PAGE_SIZE,
+    "order-by": "newest",
+    "show-fields": "bodyText",
+}
+SQS_BATCH_SIZE = 10
+SQS_MAX_WORKERS = 4
+
+# Worst case for one Guardian request is
+# (total + 1) * (connect + read timeout) + backoff, about 46 s, which
+# leaves headroom under the 60 s Lambda timeout for publishing to SQS.
+# 429 is not retried: without waiting out Retry-After an immediate retry
+# would only spend more of the Guardian API quota.
+GUARDIAN_TIMEOUT = (3.05, 12)
+GUARDIAN_RETRY = Retry(
+    total=2,
+    read=0,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=False,
+)
+
+_session = requests.Session()
+_session.mount(
+    "https://", HTTPAdapter(pool_maxsize=20, max_retries=GUARDIAN_RETRY)
+)
+_sqs_client = None
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a rate limited function is called too often.
+    """
+
+
+class RateLimiter:
+    """
+    Rate limit decorator. Every function decorated by the same instance
+    draws on one shared, thread-safe budget of max_requests per period.
+    """
+
+    def __init__(
+        self, max_requests: int = 50, period: timedelta = timedelta(days=1)
+    ):
+        self.max_requests = max_requests
+        self.period = period
+        self.period_ns = period // timedelta(microseconds=1) * 1000
+        self._requests = deque(maxlen=max_requests)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Record a request, raising RateLimitExceeded if the budget is spent.
+        """
+        with self._lock:
+            now = time.monotonic_ns()
+            cutoff = now - self.period_ns
+            timestamps = self._requests
+
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+
+            if len(timestamps) >= self.max_requests:
+                raise RateLimitExceeded(
+                    f"Rate limit exceeded. Maximum {self.max_requests} "
+                    f"message requests per {self.period.days} days."
+                )
+
+            timestamps.append(now)
+
+    def reset(self):
+        """
+        Forget all recorded requests, restoring the full budget.
+        """
+        with self._lock:
+            self._requests.clear()
+
+    def __call__(self, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self.acquire()
+            return func(*args, **kwargs)
+
+        return wrapper
 
 
 def rate_limit(
@@ -23,93 +128,246 @@ def rate_limit(
     """
     Rate limit decorator.
     """
-    message_requests = []
+    return RateLimiter(max_requests, period)
 
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            now = datetime.now()
 
-            nonlocal message_requests
-            message_requests[:] = [
-                req_time for req_time in message_requests
-                if now - req_time < period
-            ]
+guardian_rate_limit = RateLimiter()
 
-            if len(message_requests) >= max_requests:
-                raise Exception(
-                    f"Rate limit exceeded. Maximum {max_requests} "
-                    f"message requests per {period.days} days."
-                )
 
-            message_requests.append(now)
-            return func(*args, **kwargs)
+def get_sqs_client():
+    """
+    Return the SQS client, creating it on first use so that warm
+    invocations reuse the same botocore session and connection pool.
+    """
+    global _sqs_client
+    if _sqs_client is None:
+        # boto3 is imported here rather than at module level because it
+        # dominates import time and is only needed once there are
+        # articles to publish.
+        import boto3
 
-        return wrapper
+        _sqs_client = boto3.client(
+            "sqs", region_name=os.getenv("AWS_REGION", "eu-west-2")
+        )
+    return _sqs_client
 
-    return decorator
 
+def to_json(obj) -> str:
+    """
+    Serialize obj to compact JSON, without whitespace between tokens.
+    Uses orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
 
-@rate_limit()
-def fetch_articles(search_term, date_from=None):
+
+def from_json(data):
     """
-    Fetch articles from the Guardian API and send them to an SQS queue.
+    Deserialize JSON from str or bytes. Uses orjson when it is installed.
     """
-    GUARDIAN_API_URL = os.getenv("GUARDIAN_API_URL")
-    GUARDIAN_API_KEY = os.getenv("GUARDIAN_API_KEY")
-    SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    if not GUARDIAN_API_KEY:
-        raise ValueError(
-            "API key is missing. Please set the GUARDIAN_API_KEY environment "
-            "variable."
+
+def _send_entries(sqs, queue_url, articles):
+    """
+    Send articles with a single SendMessageBatch call.
+
+    Returns (article, entry) pairs for the entries SQS reported as failed.
+    """
+    response = sqs.send_message_batch(
+        QueueUrl=queue_url,
+        Entries=[
+            {"Id": str(i), "MessageBody": to_json(article)}
+            for i, article in enumerate(articles)
+        ],
+    )
+    return [
+        (articles[int(entry["Id"])], entry)
+        for entry in response.get("Failed", [])
+    ]
+
+
+def send_batch(sqs, queue_url, batch):
+    """
+    Send a single batch of articles to the SQS queue. Entries that fail
+    without a sender fault are retried once.
+
+    Returns the articles that could not be sent.
+    """
+    failed = _send_entries(sqs, queue_url, batch)
+    retryable = [
+        article for article, entry in failed if not entry.get("SenderFault")
+    ]
+    if retryable:
+        failed = [
+            (article, entry)
+            for article, entry in failed
+            if entry.get("SenderFault")
+        ]
+        failed += _send_entries(sqs, queue_url, retryable)
+
+    for article, entry in failed:
+        logger.error(
+            f"Failed to send article {article['webUrl']}: "
+            f"{entry.get('Code')} {entry.get('Message')}"
         )
+    return [article for article, _ in failed]
 
-    if not search_term or not search_term.strip():
-        raise ValueError("Search term cannot be empty")
 
-    if not SQS_QUEUE_URL:
-        raise ValueError(
-            "SQS queue URL is missing. Please set the SQS_QUEUE_URL "
-            "environment variable."
+def send_articles(sqs, queue_url, articles):
+    """
+    Send articles to the SQS queue in batches of up to SQS_BATCH_SIZE.
+
+    When there is more than one batch they are sent concurrently, using up
+    to SQS_MAX_WORKERS threads sharing the same client.
+
+    Returns the articles that could not be sent.
+    """
+    batches = [
+        articles[start:start + SQS_BATCH_SIZE]
+        for start in range(0, len(articles), SQS_BATCH_SIZE)
+    ]
+    if not batches:
+        return []
+    if len(batches) == 1:
+        return send_batch(sqs, queue_url, batches[0])
+
+    with ThreadPoolExecutor(
+        max_workers=min(SQS_MAX_WORKERS, len(batches))
+    ) as executor:
+        results = executor.map(
+            lambda batch: send_batch(sqs, queue_url, batch), batches
         )
+        return [article for failed in results for article in failed]
+
+
+def transform_article(article):
+    """
+    Keep the fields published to SQS, truncating the body text to
+    PREVIEW_LENGTH characters.
+    """
+    fields = article.get("fields")
+    return {
+        "webPublicationDate": article["webPublicationDate"],
+        "webTitle": article["webTitle"],
+        "webUrl": article["webUrl"],
+        "content_preview": (
+            fields.get("bodyText", "")[:PREVIEW_LENGTH] if fields else ""
+        ),
+    }
+
 
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def search_articles(search_term, date_from, ttl_bucket):
+    """
+    Search the Guardian API and return the transformed articles.
+
+    Results are cached per (search_term, date_from, ttl_bucket). Callers
+    pass the current SEARCH_CACHE_TTL_SECONDS window as ttl_bucket, so a
+    warm container reuses a result until the window rolls over.
+    """
     params = {
+        **BASE_PARAMS,
         "q": f'"{search_term}"',
         "api-key": GUARDIAN_API_KEY,
-        "page-size": 10,
-        "order-by": "newest",
-        "show-fields": "bodyText",
     }
 
     if date_from:
         params["from-date"] = date_from
 
+    response = _session.get(
+        GUARDIAN_API_URL, params=params, timeout=GUARDIAN_TIMEOUT
+    )
+    response.raise_for_status()
+    try:
+        payload = from_json(response.content)
+    except ValueError as e:
+        raise InvalidJSONError(
+            f"Guardian API returned invalid JSON: {e}", response=response
+        ) from e
+    articles = payload.get("response", {}).get("results", [])
+    return tuple(
+        transform_article(article)
+        for article in articles
+        if REQUIRED_FIELDS <= article.keys()
+    )
+
+
+def check_config():
+    """
+    Return a message describing the first missing configuration value,
+    or None if the configuration is complete.
+    """
+    if not GUARDIAN_API_KEY:
+        return (
+            "API key is missing. Please set the GUARDIAN_API_KEY environment "
+            "variable."
+        )
+    if not GUARDIAN_API_URL:
+        return (
+            "Guardian API URL is missing. Please set the GUARDIAN_API_URL "
+            "environment variable."
+        )
+    if not SQS_QUEUE_URL:
+        return (
+            "SQS queue URL is missing. Please set the SQS_QUEUE_URL "
+            "environment variable."
+        )
+    return None
+
+
+CONFIG_ERROR = check_config()
+
+
+@guardian_rate_limit
+def fetch_articles(search_term, date_from=None):
+    """
+    Fetch articles from the Guardian API and send them to an SQS queue.
+
+    Returns the articles that were published; any that SQS rejected are
+    left out.
+    """
+    if CONFIG_ERROR:
+        raise ValueError(CONFIG_ERROR)
+
+    if not isinstance(search_term, str):
+        raise ValueError("Search term must be a string")
+
+    if not search_term.strip():
+        raise ValueError("Search term cannot be empty")
+
+    if date_from is not None and not isinstance(date_from, str):
+        raise ValueError("date_from must be a date string")
+
     try:
-        response = requests.get(GUARDIAN_API_URL, params=params, timeout=30)
-        response.raise_for_status()
-        articles = response.json().get("response", {}).get("results", [])
+        # Copy the cached articles so callers cannot modify the cache.
         transformed_articles = [
-            {
-                "webPublicationDate": article["webPublicationDate"],
-                "webTitle": article["webTitle"],
-                "webUrl": article["webUrl"],
-                "content_preview": article.get("fields", {})
-                .get("bodyText", "")[:1000],
-            }
-            for article in articles
-            if all(
-                field in article
-                for field in ["webPublicationDate", "webTitle", "webUrl"]
+            dict(article)
+            for article in search_articles(
+                search_term,
+                date_from,
+                int(time.monotonic() // SEARCH_CACHE_TTL_SECONDS),
             )
         ]
 
-        sqs = boto3.client("sqs", region_name="eu-west-2")
-        for article in transformed_articles:
-            sqs.send_message(
-                QueueUrl=SQS_QUEUE_URL,
-                MessageBody=json.dumps(article)
-            )
+        if not transformed_articles:
+            return []
+
+        failed = send_articles(
+            get_sqs_client(), SQS_QUEUE_URL, transformed_articles
+        )
+        if failed:
+            # send_articles returns the same dicts it was given, so match
+            # on identity; payload fields such as webUrl may repeat.
+            failed_ids = {id(article) for article in failed}
+            transformed_articles = [
+                article
+                for article in transformed_articles
+                if id(article) not in failed_ids
+            ]
 
         return transformed_articles
 
@@ -121,6 +379,14 @@ def fetch_articles(search_term, date_from=None):
         return []
 
 
+def error_response(status_code, error):
+    """
+    Log error and build the Lambda response reporting it.
+    """
+    logger.error(f"Error in lambda_handler: {error}")
+    return {"statusCode": status_code, "body": to_json({"error": str(error)})}
+
+
 def lambda_handler(event, context):
     """
     Lambda function handler to fetch articles from the Guardian API.
@@ -130,7 +396,11 @@ def lambda_handler(event, context):
 
     try:
         articles = fetch_articles(search_term, date_from)
-        return {"statusCode": 200, "body": json.dumps(articles)}
-    except Exception as e:
-        logger.error(f"Error in lambda_handler: {e}")
-        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+    except ValueError as e:
+        return error_response(400, e)
+    except RateLimitExceeded as e:
+        return error_response(429, e)
+    except RequestException as e:
+        return error_response(500, e)
+
+    return {"statusCode": 200, "body": to_json(articles)}
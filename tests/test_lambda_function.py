@@ -4,78 +4,116 @@ Tests for lambda_function.py
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from unittest.mock import Mock, patch
 
 import pytest
-from requests.exceptions import RequestException, Timeout
+from requests.exceptions import InvalidJSONError, RequestException, Timeout
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    MaxRetryError,
+    ReadTimeoutError
+)
+from urllib3.response import HTTPResponse
 
 from src.lambda_function import (
+    GUARDIAN_RETRY,
+    GUARDIAN_TIMEOUT,
+    RateLimiter,
+    RateLimitExceeded,
+    _session,
+    check_config,
     fetch_articles,
+    from_json,
+    get_sqs_client,
+    guardian_rate_limit,
     lambda_handler,
-    rate_limit
+    rate_limit,
+    search_articles,
+    send_articles,
+    to_json,
+    transform_article
 )
 
+# Matches the guardian_api function timeout in terraform/main.tf.
+LAMBDA_TIMEOUT_SECONDS = 60
+
+
+@pytest.fixture(autouse=True)
+def set_configuration(monkeypatch):
+    """Set the configuration read from the environment for testing."""
+    monkeypatch.setattr(
+        "src.lambda_function.SQS_QUEUE_URL", "http://mock-sqs-url.com"
+    )
+    monkeypatch.setattr(
+        "src.lambda_function.GUARDIAN_API_URL", "https://test.guardianapi.com"
+    )
+    monkeypatch.setattr(
+        "src.lambda_function.GUARDIAN_API_KEY", "mock-api-key"
+    )
+    monkeypatch.setattr("src.lambda_function.CONFIG_ERROR", None)
+
 
 @pytest.fixture(autouse=True)
-def set_environment_variables(monkeypatch):
-    """Set environment variables for testing."""
-    monkeypatch.setenv("SQS_QUEUE_URL", "http://mock-sqs-url.com")
-    monkeypatch.setenv("GUARDIAN_API_URL", "https://test.guardianapi.com")
-    monkeypatch.setenv("GUARDIAN_API_KEY", "mock-api-key")
+def clear_search_cache():
+    """Start every test with an empty Guardian search cache."""
+    search_articles.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_guardian_rate_limit():
+    """Start every test with the full Guardian rate limit budget."""
+    guardian_rate_limit.reset()
 
 
 @pytest.fixture
 def mock_requests_get():
-    """Fixture for mocking requests.get."""
-    with patch("src.lambda_function.requests.get") as mock_get:
+    """Fixture for mocking the Guardian API session's get."""
+    with patch("src.lambda_function._session.get") as mock_get:
         yield mock_get
 
 
-@pytest.fixture
-def mock_successful_response():
-    """Fixture for mocking a successful API response."""
+TEST_ARTICLE = {
+    "webPublicationDate": "2024-01-01T10:00:00Z",
+    "webTitle": "Test Article",
+    "webUrl": "http://test.com",
+    "fields": {"bodyText": "Test content"},
+}
+
+
+def make_response(payload):
+    """Build a mock API response whose body is payload encoded as JSON."""
     mock_response = Mock()
-    mock_response.json.return_value = {
-        "response": {
-            "results": [
-                {
-                    "webPublicationDate": "2024-01-01T10:00:00Z",
-                    "webTitle": "Test Article",
-                    "webUrl": "http://test.com",
-                    "fields": {"bodyText": "Test content"},
-                }
-            ]
-        }
-    }
+    mock_response.content = json.dumps(payload).encode()
     mock_response.raise_for_status.return_value = None
     return mock_response
 
 
+@pytest.fixture
+def mock_successful_response():
+    """Fixture for mocking a successful API response."""
+    return make_response({"response": {"results": [TEST_ARTICLE]}})
+
+
 @pytest.fixture
 def mock_empty_response():
     """Fixture for empty API response."""
-    mock_response = Mock()
-    mock_response.json.return_value = {"response": {"results": []}}
-    mock_response.raise_for_status.return_value = None
-    return mock_response
+    return make_response({"response": {"results": []}})
 
 
 @pytest.fixture
 def mock_malformed_response():
     """Fixture for malformed API response."""
-    mock_response = Mock()
-    mock_response.json.return_value = {"malformed": "response"}
-    mock_response.raise_for_status.return_value = None
-    return mock_response
+    return make_response({"malformed": "response"})
 
 
 @pytest.fixture
 def mock_sqs_client():
     """Fixture for mocking SQS client"""
-    with patch("boto3.client") as mock_client:
+    with patch("src.lambda_function.get_sqs_client") as mock_get_client:
         mock_sqs = Mock()
-        mock_client.return_value = mock_sqs
+        mock_get_client.return_value = mock_sqs
         yield mock_sqs
 
 
@@ -91,8 +129,9 @@ class TestFetchArticles:
     ):
         """Test successful fetch_articles call."""
         mock_requests_get.return_value = mock_successful_response
-        mock_sqs_client.send_message.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
+        mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [{"Id": "0"}],
+            "Failed": [],
         }
 
         articles = fetch_articles("test", "2024-01-01")
@@ -103,6 +142,22 @@ class TestFetchArticles:
         assert article["webUrl"] == "http://test.com"
         assert article["webPublicationDate"] == "2024-01-01T10:00:00Z"
         assert article["content_preview"] == "Test content"
+        mock_requests_get.assert_called_once_with(
+            "https://test.guardianapi.com",
+            params={
+                "page-size": 10,
+                "order-by": "newest",
+                "show-fields": "bodyText",
+                "q": '"test"',
+                "api-key": "mock-api-key",
+                "from-date": "2024-01-01",
+            },
+            timeout=(3.05, 12),
+        )
+        mock_sqs_client.send_message_batch.assert_called_once_with(
+            QueueUrl="http://mock-sqs-url.com",
+            Entries=[{"Id": "0", "MessageBody": to_json(article)}],
+        )
 
     @pytest.mark.it("Should fetch articles without date_from")
     def test_should_fetch_articles_without_date_from(
@@ -110,8 +165,9 @@ class TestFetchArticles:
     ):
         """Test fetch_articles call without date_from."""
         mock_requests_get.return_value = mock_successful_response
-        mock_sqs_client.send_message.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
+        mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [{"Id": "0"}],
+            "Failed": [],
         }
 
         articles = fetch_articles("test")
@@ -124,15 +180,20 @@ class TestFetchArticles:
         assert article["content_preview"] == "Test content"
 
     @pytest.mark.it("Should raise ValueError if API key is missing")
-    def test_should_handle_missing_api_key(self):
+    def test_should_handle_missing_api_key(self, monkeypatch):
         """Test missing API key."""
-        with patch(
-            "src.lambda_function.os.getenv",
-            side_effect=lambda key: None if key == "GUARDIAN_API_KEY"
-            else "mock-value",
-        ):
-            with pytest.raises(ValueError, match="API key is missing"):
-                fetch_articles("test")
+        monkeypatch.setattr("src.lambda_function.GUARDIAN_API_KEY", None)
+        monkeypatch.setattr("src.lambda_function.CONFIG_ERROR", check_config())
+        with pytest.raises(ValueError, match="API key is missing"):
+            fetch_articles("test")
+
+    @pytest.mark.it("Should raise ValueError if API URL is missing")
+    def test_should_handle_missing_api_url(self, monkeypatch):
+        """Test missing Guardian API URL."""
+        monkeypatch.setattr("src.lambda_function.GUARDIAN_API_URL", None)
+        monkeypatch.setattr("src.lambda_function.CONFIG_ERROR", check_config())
+        with pytest.raises(ValueError, match="Guardian API URL is missing"):
+            fetch_articles("test")
 
     @pytest.mark.it("Should raise ValueError if search term is empty")
     def test_should_handle_empty_search_term(self):
@@ -141,15 +202,12 @@ class TestFetchArticles:
             fetch_articles("")
 
     @pytest.mark.it("Should raise ValueError if SQS queue URL is missing")
-    def test_should_handle_missing_sqs_queue_url(self):
+    def test_should_handle_missing_sqs_queue_url(self, monkeypatch):
         """Test missing SQS queue URL."""
-        with patch(
-            "src.lambda_function.os.getenv",
-            side_effect=lambda key: None if key == "SQS_QUEUE_URL"
-            else "mock-value",
-        ):
-            with pytest.raises(ValueError, match="SQS queue URL is missing"):
-                fetch_articles("test")
+        monkeypatch.setattr("src.lambda_function.SQS_QUEUE_URL", None)
+        monkeypatch.setattr("src.lambda_function.CONFIG_ERROR", check_config())
+        with pytest.raises(ValueError, match="SQS queue URL is missing"):
+            fetch_articles("test")
 
     @pytest.mark.it("Should handle RequestException")
     def test_should_handle_request_exception(self, mock_requests_get):
@@ -186,6 +244,123 @@ class TestFetchArticles:
         articles = fetch_articles("test")
         assert articles == []
 
+    @pytest.mark.it("Should raise InvalidJSONError for a non-JSON body")
+    def test_should_raise_for_non_json_body(self, mock_requests_get):
+        """Test a 200 response that is not JSON is treated as an error."""
+        mock_response = Mock()
+        mock_response.content = b"<html>Service unavailable</html>"
+        mock_response.raise_for_status.return_value = None
+        mock_requests_get.return_value = mock_response
+
+        with pytest.raises(InvalidJSONError):
+            fetch_articles("test")
+
+        response = lambda_handler({"search_term": "test"}, None)
+        assert response["statusCode"] == 500
+
+    @pytest.mark.it("Should skip articles missing required fields")
+    def test_should_skip_incomplete_articles(
+        self, mock_requests_get, mock_sqs_client
+    ):
+        """Test articles without required fields are dropped."""
+        mock_requests_get.return_value = make_response(
+            {
+                "response": {
+                    "results": [TEST_ARTICLE, {"webTitle": "No URL or date"}]
+                }
+            }
+        )
+        mock_sqs_client.send_message_batch.return_value = {"Failed": []}
+
+        articles = fetch_articles("test")
+
+        assert [article["webTitle"] for article in articles] == [
+            "Test Article"
+        ]
+
+    @pytest.mark.it("Should leave out articles that failed to publish")
+    def test_should_leave_out_unpublished_articles(
+        self, mock_requests_get, mock_sqs_client
+    ):
+        """Test articles rejected by SQS are not returned."""
+        mock_requests_get.return_value = make_response(
+            {
+                "response": {
+                    "results": [
+                        TEST_ARTICLE,
+                        {**TEST_ARTICLE, "webUrl": "http://test.com/bad"},
+                    ]
+                }
+            }
+        )
+        mock_sqs_client.send_message_batch.return_value = {
+            "Failed": [{"Id": "1", "SenderFault": True}]
+        }
+
+        articles = fetch_articles("test")
+
+        assert [article["webUrl"] for article in articles] == [
+            "http://test.com"
+        ]
+
+    @pytest.mark.it("Should keep published articles sharing a failed URL")
+    def test_should_keep_published_duplicate_urls(
+        self, mock_requests_get, mock_sqs_client
+    ):
+        """Test only the failed entry is dropped when URLs repeat."""
+        mock_requests_get.return_value = make_response(
+            {"response": {"results": [TEST_ARTICLE, TEST_ARTICLE]}}
+        )
+        mock_sqs_client.send_message_batch.return_value = {
+            "Failed": [{"Id": "1", "SenderFault": True}]
+        }
+
+        articles = fetch_articles("test")
+
+        assert len(articles) == 1
+        assert articles[0]["webUrl"] == "http://test.com"
+
+    @pytest.mark.it("Should reuse cached results but still publish them")
+    def test_should_reuse_cached_search(
+        self, mock_requests_get, mock_successful_response, mock_sqs_client
+    ):
+        """Test repeated searches hit the cache."""
+        mock_requests_get.return_value = mock_successful_response
+        mock_sqs_client.send_message_batch.return_value = {"Failed": []}
+
+        first = fetch_articles("test")
+        second = fetch_articles("test")
+
+        assert first == second
+        mock_requests_get.assert_called_once()
+        assert mock_sqs_client.send_message_batch.call_count == 2
+
+    @pytest.mark.it("Should not let callers modify cached results")
+    def test_should_return_copies_of_cached_results(
+        self, mock_requests_get, mock_successful_response, mock_sqs_client
+    ):
+        """Test mutating returned articles leaves the cache intact."""
+        mock_requests_get.return_value = mock_successful_response
+        mock_sqs_client.send_message_batch.return_value = {"Failed": []}
+
+        first = fetch_articles("test")
+        first[0]["webTitle"] = "MUTATED"
+        second = fetch_articles("test")
+
+        assert second[0]["webTitle"] == "Test Article"
+
+    @pytest.mark.it("Should raise ValueError if date_from is not a string")
+    def test_should_reject_non_string_date_from(self, mock_requests_get):
+        """Test unhashable date_from values are rejected up front."""
+        with pytest.raises(ValueError, match="date_from"):
+            fetch_articles("test", ["2024-01-01"])
+
+        response = lambda_handler(
+            {"search_term": "test", "date_from": ["2024-01-01"]}, None
+        )
+        assert response["statusCode"] == 400
+        mock_requests_get.assert_not_called()
+
     @pytest.mark.it("Should handle generic exception")
     def test_should_handle_generic_exception(self, mock_requests_get):
         """Test handling generic exception."""
@@ -194,6 +369,257 @@ class TestFetchArticles:
         assert articles == []
 
 
+class TestSearchArticles:
+    """Tests for search_articles function."""
+
+    @pytest.mark.it("Should query the API again in a new TTL window")
+    def test_should_expire_cache_between_windows(
+        self, mock_requests_get, mock_successful_response
+    ):
+        """Test the TTL bucket is part of the cache key."""
+        mock_requests_get.return_value = mock_successful_response
+
+        search_articles("test", None, 1)
+        search_articles("test", None, 1)
+        search_articles("test", None, 2)
+
+        assert mock_requests_get.call_count == 2
+
+
+class TestTransformArticle:
+    """Tests for transform_article function."""
+
+    @pytest.mark.it("Should truncate the body text preview")
+    def test_should_truncate_preview(self):
+        """Test long body text is cut to the preview length."""
+        article = {**TEST_ARTICLE, "fields": {"bodyText": "x" * 1500}}
+
+        assert transform_article(article)["content_preview"] == "x" * 1000
+
+    @pytest.mark.it("Should use an empty preview when fields are missing")
+    def test_should_handle_missing_fields(self):
+        """Test articles without fields get an empty preview."""
+        article = {**TEST_ARTICLE, "fields": None}
+
+        assert transform_article(article)["content_preview"] == ""
+
+
+class TestToJson:
+    """Tests for to_json function."""
+
+    @pytest.mark.it("Should serialize without whitespace")
+    def test_should_serialize_compactly(self):
+        """Test compact JSON serialization."""
+        assert to_json({"a": [1, 2]}) == '{"a":[1,2]}'
+
+    @pytest.mark.it("Should keep non-ASCII characters unescaped")
+    def test_should_keep_non_ascii(self):
+        """Test non-ASCII text is emitted as UTF-8, not escaped."""
+        assert to_json({"a": "café – £5"}) == '{"a":"café – £5"}'
+
+    @pytest.mark.it("Should serialize without orjson installed")
+    def test_should_serialize_without_orjson(self, monkeypatch):
+        """Test the standard library fallback."""
+        monkeypatch.setattr("src.lambda_function.orjson", None)
+        assert to_json({"a": [1, 2]}) == '{"a":[1,2]}'
+        assert to_json({"a": "café – £5"}) == '{"a":"café – £5"}'
+
+
+class TestFromJson:
+    """Tests for from_json function."""
+
+    @pytest.mark.it("Should deserialize bytes and str")
+    def test_should_deserialize(self):
+        """Test JSON deserialization."""
+        assert from_json(b'{"a":[1,2]}') == {"a": [1, 2]}
+        assert from_json('{"a":[1,2]}') == {"a": [1, 2]}
+
+    @pytest.mark.it("Should deserialize without orjson installed")
+    def test_should_deserialize_without_orjson(self, monkeypatch):
+        """Test the standard library fallback."""
+        monkeypatch.setattr("src.lambda_function.orjson", None)
+        assert from_json(b'{"a":[1,2]}') == {"a": [1, 2]}
+
+
+class TestSendArticles:
+    """Tests for send_articles function."""
+
+    @staticmethod
+    def make_articles(count):
+        """Build a list of minimal transformed articles."""
+        return [
+            {"webTitle": f"Article {i}", "webUrl": f"http://test.com/{i}"}
+            for i in range(count)
+        ]
+
+    @pytest.mark.it("Should send articles in batches of ten")
+    def test_should_send_articles_in_batches(self):
+        """Test articles are chunked into SQS batches."""
+        sqs = Mock()
+        sqs.send_message_batch.return_value = {"Failed": []}
+
+        failed = send_articles(sqs, "queue-url", self.make_articles(25))
+
+        assert failed == []
+        batch_sizes = [
+            len(call.kwargs["Entries"])
+            for call in sqs.send_message_batch.call_args_list
+        ]
+        assert batch_sizes == [10, 10, 5]
+
+    @pytest.mark.it("Should retry server-side failures once")
+    def test_should_retry_server_side_failures(self):
+        """Test entries failing without a sender fault are resent."""
+        sqs = Mock()
+        articles = self.make_articles(2)
+        sqs.send_message_batch.side_effect = [
+            {"Failed": [{"Id": "1", "SenderFault": False}]},
+            {"Failed": []},
+        ]
+
+        failed = send_articles(sqs, "queue-url", articles)
+
+        assert failed == []
+        retry_entries = sqs.send_message_batch.call_args.kwargs["Entries"]
+        assert retry_entries == [
+            {"Id": "0", "MessageBody": to_json(articles[1])}
+        ]
+
+    @pytest.mark.it("Should return and log articles that fail after retry")
+    def test_should_return_failed_articles(self, caplog):
+        """Test articles failing twice are reported."""
+        sqs = Mock()
+        articles = self.make_articles(2)
+        sqs.send_message_batch.side_effect = [
+            {"Failed": [{"Id": "1", "SenderFault": False}]},
+            {
+                "Failed": [
+                    {
+                        "Id": "0",
+                        "SenderFault": False,
+                        "Code": "InternalError",
+                        "Message": "Boom",
+                    }
+                ]
+            },
+        ]
+
+        failed = send_articles(sqs, "queue-url", articles)
+
+        assert failed == [articles[1]]
+        assert "http://test.com/1" in caplog.text
+
+    @pytest.mark.it("Should not retry sender faults")
+    def test_should_not_retry_sender_faults(self):
+        """Test entries rejected as sender faults are not resent."""
+        sqs = Mock()
+        articles = self.make_articles(2)
+        sqs.send_message_batch.return_value = {
+            "Failed": [{"Id": "0", "SenderFault": True}]
+        }
+
+        failed = send_articles(sqs, "queue-url", articles)
+
+        assert failed == [articles[0]]
+        sqs.send_message_batch.assert_called_once()
+
+    @pytest.mark.it("Should collect failed articles from every batch")
+    def test_should_collect_failures_across_batches(self):
+        """Test failures from concurrently sent batches are combined."""
+        sqs = Mock()
+        articles = self.make_articles(30)
+        sqs.send_message_batch.return_value = {
+            "Failed": [{"Id": "0", "SenderFault": True}]
+        }
+
+        failed = send_articles(sqs, "queue-url", articles)
+
+        assert failed == [articles[0], articles[10], articles[20]]
+
+
+class TestGetSqsClient:
+    """Tests for get_sqs_client function."""
+
+    @pytest.mark.it("Should create the SQS client once and reuse it")
+    def test_should_reuse_sqs_client(self, monkeypatch):
+        """Test the SQS client is cached between calls."""
+        monkeypatch.setattr("src.lambda_function._sqs_client", None)
+        with patch("boto3.client") as mock_client:
+            first = get_sqs_client()
+            second = get_sqs_client()
+
+        assert first is second
+        mock_client.assert_called_once()
+
+
+def worst_case_request_seconds(**failure):
+    """
+    Walk GUARDIAN_RETRY through repeated failures and return the longest
+    a Guardian request can take, with the number of attempts made.
+    """
+    retry = GUARDIAN_RETRY
+    attempts = 1
+    waited = 0.0
+    while True:
+        try:
+            retry = retry.increment(method="GET", url="/search", **failure)
+        except MaxRetryError:
+            break
+        attempts += 1
+        waited += retry.get_backoff_time()
+        response = failure.get("response")
+        if response is not None and retry.respect_retry_after_header:
+            waited += retry.get_retry_after(response) or 0
+    return attempts * sum(GUARDIAN_TIMEOUT) + waited, attempts
+
+
+class TestSession:
+    """Tests for the Guardian API session configuration."""
+
+    @pytest.mark.it("Should use the retry policy for HTTPS requests")
+    def test_should_mount_retry_policy(self):
+        """Test the HTTPS adapter uses GUARDIAN_RETRY."""
+        adapter = _session.get_adapter("https://test.guardianapi.com")
+
+        assert adapter.max_retries is GUARDIAN_RETRY
+
+    @pytest.mark.it("Should bound connect retries within the Lambda timeout")
+    def test_should_bound_connect_retries(self):
+        """Test repeated connect timeouts finish before Lambda times out."""
+        seconds, attempts = worst_case_request_seconds(
+            error=ConnectTimeoutError()
+        )
+
+        assert attempts == 3
+        assert seconds < LAMBDA_TIMEOUT_SECONDS
+
+    @pytest.mark.it("Should bound status retries within the Lambda timeout")
+    def test_should_bound_status_retries(self):
+        """Test retried 503s ignore a long Retry-After header."""
+        assert GUARDIAN_RETRY.is_retry("GET", 503)
+        response = HTTPResponse(status=503, headers={"Retry-After": "120"})
+
+        seconds, attempts = worst_case_request_seconds(response=response)
+
+        assert attempts == 3
+        assert seconds < LAMBDA_TIMEOUT_SECONDS
+
+    @pytest.mark.it("Should not retry rate-limited responses")
+    def test_should_not_retry_rate_limited_responses(self):
+        """Test a 429 is returned to the caller instead of retried."""
+        assert not GUARDIAN_RETRY.is_retry("GET", 429)
+        assert not GUARDIAN_RETRY.is_retry("GET", 429, has_retry_after=True)
+
+    @pytest.mark.it("Should not retry read timeouts")
+    def test_should_not_retry_read_timeouts(self):
+        """Test a read timeout fails on the first attempt."""
+        _, attempts = worst_case_request_seconds(
+            error=ReadTimeoutError(None, "/search", "timed out")
+        )
+
+        assert attempts == 1
+
+
 class TestLambdaHandler:
     """Tests for lambda_handler function."""
 
@@ -209,11 +635,13 @@ class TestLambdaHandler:
         assert response["statusCode"] == 200
         assert json.loads(response["body"]) == [{"webTitle": "Test Article"}]
 
-    @pytest.mark.it("Should return 500 and error message on exception.")
+    @pytest.mark.it("Should return 500 and error message on request error.")
     @patch("src.lambda_function.fetch_articles")
     def test_lambda_handler_error(self, mock_fetch_articles):
-        """Test lambda_handler call with exception."""
-        mock_fetch_articles.side_effect = Exception("Error fetching articles")
+        """Test lambda_handler call with a request exception."""
+        mock_fetch_articles.side_effect = RequestException(
+            "Error fetching articles"
+        )
         event = {"search_term": "test", "date_from": "2024-01-01"}
 
         response = lambda_handler(event, None)
@@ -222,6 +650,51 @@ class TestLambdaHandler:
         error_message = json.loads(response["body"])["error"]
         assert "Error fetching articles" in error_message
 
+    @pytest.mark.it("Should return 400 on invalid input or configuration")
+    @patch("src.lambda_function.fetch_articles")
+    def test_lambda_handler_value_error(self, mock_fetch_articles):
+        """Test lambda_handler call with a ValueError."""
+        mock_fetch_articles.side_effect = ValueError(
+            "Search term cannot be empty"
+        )
+
+        response = lambda_handler({"search_term": ""}, None)
+
+        assert response["statusCode"] == 400
+        error_message = json.loads(response["body"])["error"]
+        assert "Search term cannot be empty" in error_message
+
+    @pytest.mark.it("Should return 400 for a non-string search term")
+    def test_lambda_handler_non_string_search_term(self):
+        """Test lambda_handler rejects a search term that is not a str."""
+        for search_term in (5, ["a"]):
+            response = lambda_handler({"search_term": search_term}, None)
+
+            assert response["statusCode"] == 400
+            error_message = json.loads(response["body"])["error"]
+            assert "Search term must be a string" in error_message
+
+    @pytest.mark.it("Should return 429 when the rate limit is exceeded")
+    @patch("src.lambda_function.fetch_articles")
+    def test_lambda_handler_rate_limited(self, mock_fetch_articles):
+        """Test lambda_handler call when rate limited."""
+        mock_fetch_articles.side_effect = RateLimitExceeded(
+            "Rate limit exceeded"
+        )
+
+        response = lambda_handler({"search_term": "test"}, None)
+
+        assert response["statusCode"] == 429
+
+    @pytest.mark.it("Should let unexpected exceptions propagate")
+    @patch("src.lambda_function.fetch_articles")
+    def test_lambda_handler_unexpected_error(self, mock_fetch_articles):
+        """Test lambda_handler does not swallow unexpected errors."""
+        mock_fetch_articles.side_effect = KeyError("boom")
+
+        with pytest.raises(KeyError):
+            lambda_handler({"search_term": "test"}, None)
+
 
 class TestRateLimit:
     """Tests for rate_limit decorator."""
@@ -246,7 +719,7 @@ class TestRateLimit:
             return True
 
         test_func()
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(RateLimitExceeded) as exc_info:
             test_func()
         assert "Rate limit exceeded" in str(exc_info.value)
 
@@ -261,3 +734,52 @@ class TestRateLimit:
         assert test_func() is True
         time.sleep(1)
         assert test_func() is True
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter class."""
+
+    @pytest.mark.it("Should share one budget across decorated functions")
+    def test_should_share_budget_across_functions(self):
+        """Test functions decorated by one limiter share its budget."""
+        limiter = RateLimiter(max_requests=2, period=timedelta(seconds=1))
+
+        @limiter
+        def first():
+            return True
+
+        @limiter
+        def second():
+            return True
+
+        assert first() is True
+        assert second() is True
+        with pytest.raises(RateLimitExceeded):
+            first()
+
+    @pytest.mark.it("Should restore the full budget on reset")
+    def test_should_restore_budget_on_reset(self):
+        """Test reset forgets recorded requests."""
+        limiter = RateLimiter(max_requests=1, period=timedelta(seconds=10))
+        limiter.acquire()
+
+        limiter.reset()
+
+        limiter.acquire()
+
+    @pytest.mark.it("Should not exceed the budget under concurrent calls")
+    def test_should_be_thread_safe(self):
+        """Test concurrent callers cannot overspend the budget."""
+        limiter = RateLimiter(max_requests=50, period=timedelta(seconds=10))
+
+        def call():
+            try:
+                limiter.acquire()
+                return True
+            except RateLimitExceeded:
+                return False
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: call(), range(100)))
+
+        assert results.count(True) == 50